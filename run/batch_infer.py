@@ -165,12 +165,18 @@ def main(cfg: EnsembleMainConfig):
     )
     with trace("** load eeg"):
         eeg_ids = metadata["eeg_id"].unique().to_list()
-        id2eeg = preload_eegs(eeg_ids, eeg_dir)
-        id2cqf = preload_cqf(eeg_ids, eeg_dir)
+        id2eeg = preload_eegs(
+            eeg_ids, eeg_dir, num_workers=cfg.env.num_workers, dtype=np.float16
+        )
+        id2cqf = preload_cqf(
+            eeg_ids, eeg_dir, num_workers=cfg.env.num_workers, dtype=np.float16
+        )
 
     with trace("** load bg spec"):
         spec_ids = metadata["spectrogram_id"].unique().to_list()
-        spec_id2spec = preload_spectrograms(spec_ids, spec_dir)
+        spec_id2spec = preload_spectrograms(
+            spec_ids, spec_dir, num_workers=cfg.env.num_workers
+        )
 
     with trace("** predict per experiments"):
         predictions = []
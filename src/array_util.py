@@ -9,6 +9,27 @@ def find_nearest_multiple(n, m):
     return n + (m - n % m) % m
 
 
+def aligned_empty(
+    shape: tuple[int, ...], dtype=np.float32, align: int = 64
+) -> np.ndarray:
+    """
+    Allocate an uninitialized C-contiguous array whose data pointer is aligned to
+    `align` bytes (np.empty only guarantees 16 bytes).
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + align, dtype=np.uint8)
+    offset = (-buf.ctypes.data) % align
+    return buf[offset : offset + nbytes].view(dtype).reshape(shape)
+
+
+def aligned_copy(xs: np.ndarray, dtype=None, align: int = 64) -> np.ndarray:
+    """Copy (and optionally cast) `xs` into a buffer aligned to `align` bytes."""
+    out = aligned_empty(xs.shape, dtype=dtype or xs.dtype, align=align)
+    out[...] = xs
+    return out
+
+
 def pad_multiple_of(
     xs: np.ndarray,
     divisor: int,
@@ -26,7 +47,7 @@ def pad_multiple_of(
         pad_value: The value to pad the tensor with (default=0)
 
     Returns:
-        The padded array.
+        The padded array. If no padding is needed, `xs` itself is returned.
     """
     length = find_nearest_multiple(xs.shape[axis], divisor)
     pad_size = length - xs.shape[axis]
@@ -43,8 +64,35 @@ def pad_multiple_of(
     else:
         raise ValueError(f"Unknown padding type: {padding_type}")
 
-    return np.pad(
-        xs,
-        [(left_pad, right_pad) if i == axis else (0, 0) for i in range(xs.ndim)],
-        **kwargs,
-    )
+    if pad_size == 0:
+        return xs
+
+    mode = kwargs.get("mode", "constant")
+    constant_value = kwargs.get("constant_values", 0)
+    num_frames = xs.shape[axis]
+    if (
+        mode not in ("constant", "reflect")
+        or np.ndim(constant_value) > 0
+        or (mode == "reflect" and max(left_pad, right_pad) >= num_frames)
+    ):
+        return np.pad(
+            xs,
+            [(left_pad, right_pad) if i == axis else (0, 0) for i in range(xs.ndim)],
+            **kwargs,
+        )
+
+    # preallocate and fill instead of going through np.pad
+    shape = list(xs.shape)
+    shape[axis] = length
+    out = np.empty(shape, dtype=xs.dtype)
+    src = np.moveaxis(xs, axis, 0)
+    dst = np.moveaxis(out, axis, 0)
+    dst[left_pad : left_pad + num_frames] = src
+    if mode == "constant":
+        dst[:left_pad] = constant_value
+        dst[left_pad + num_frames :] = constant_value
+    else:
+        tail = src[num_frames - 1 - right_pad : num_frames - 1]
+        dst[:left_pad] = src[1 : left_pad + 1][::-1]
+        dst[left_pad + num_frames :] = tail[::-1]
+    return out
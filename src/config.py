@@ -10,6 +10,7 @@ class EnvironmentConfig:
     num_workers: int
     infer_batch_size: int
     grad_checkpointing: bool
+    compile_model: bool
     data_dir: str
     working_dir: str
     output_dir: str
@@ -1,60 +1,80 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
 import polars as pl
 from tqdm import tqdm
 
+from src.array_util import aligned_copy
+
 
 def train_valid_split(metadata: pl.DataFrame, fold_split_df: pl.DataFrame, fold: int):
-    eeg_ids_train = (
-        fold_split_df.filter(pl.col("fold").eq(fold).not_())
-        .select("eeg_id")
-        .to_numpy()
-        .flatten()
-    )
-    eeg_ids_valid = (
-        fold_split_df.filter(pl.col("fold").eq(fold))
-        .select("eeg_id")
-        .to_numpy()
-        .flatten()
-    )
-    train_df = metadata.filter(pl.col("eeg_id").is_in(eeg_ids_train)).drop("fold")
-    valid_df = metadata.filter(pl.col("eeg_id").is_in(eeg_ids_valid)).drop("fold")
+    eeg_ids_train = fold_split_df.filter(pl.col("fold").ne(fold)).select("eeg_id")
+    eeg_ids_valid = fold_split_df.filter(pl.col("fold").eq(fold)).select("eeg_id")
+    # semi join: hash-filter rows of `metadata` without duplicating them
+    train_df = metadata.join(eeg_ids_train, on="eeg_id", how="semi").drop("fold")
+    valid_df = metadata.join(eeg_ids_valid, on="eeg_id", how="semi").drop("fold")
     return train_df, valid_df
 
 
+def _load_parallel(
+    keys: list[int], load_fn: Callable[[int], np.ndarray], num_workers: int = 1
+) -> dict[int, np.ndarray]:
+    """
+    `np.load` releases the GIL while reading, so a thread pool overlaps disk I/O.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        arrays = executor.map(load_fn, keys)
+        return dict(tqdm(zip(keys, arrays), total=len(keys)))
+
+
 def preload_eegs(
     eeg_ids: list[int],
     preprocess_dir: Path,
     max_channels: int = 19,
+    num_workers: int = 1,
+    dtype=np.float32,
 ):
-    id2eeg = dict()
-    for eeg_id in tqdm(eeg_ids):
-        eeg = np.load(preprocess_dir / str(eeg_id) / "eeg.npy")
-        id2eeg[eeg_id] = eeg[..., :max_channels]
+    """
+    num_workers: number of threads used to read the files.
+    dtype: storage dtype. EEG is saved as float16, so `np.float16` halves the
+        memory; crops are converted to float32 by the dataset.
+    """
 
-    return id2eeg
+    def load(eeg_id: int) -> np.ndarray:
+        eeg = np.load(preprocess_dir / str(eeg_id) / "eeg.npy")[..., :max_channels]
+        return aligned_copy(eeg, dtype=dtype)
+
+    return _load_parallel(eeg_ids, load, num_workers=num_workers)
 
 
 def preload_cqf(
     eeg_ids: list[int],
     preprocess_dir: Path,
+    num_workers: int = 1,
+    dtype=np.float32,
 ):
-    id2cqf = dict()
-    for eeg_id in tqdm(eeg_ids):
+    """
+    num_workers: number of threads used to read the files.
+    dtype: storage dtype. CQF lies in (0, 1] and is saved as float16, so
+        `np.float16` halves the memory without losing precision; crops are
+        converted to float32 by the dataset.
+    """
+
+    def load(eeg_id: int) -> np.ndarray:
         cqf = np.load(preprocess_dir / str(eeg_id) / "cqf.npy")
-        id2cqf[eeg_id] = cqf
+        return aligned_copy(cqf, dtype=dtype)
 
-    return id2cqf
+    return _load_parallel(eeg_ids, load, num_workers=num_workers)
 
 
 def preload_spectrograms(
     spectrogram_ids: list[int],
     preprocess_dir: Path,
+    num_workers: int = 1,
 ):
-    spectrogram_id2spec = dict()
-    for spectrogram_id in tqdm(spectrogram_ids):
-        spectrogram = np.load(preprocess_dir / str(spectrogram_id) / "spectrogram.npy")
-        spectrogram_id2spec[spectrogram_id] = spectrogram
+    def load(spectrogram_id: int) -> np.ndarray:
+        return np.load(preprocess_dir / str(spectrogram_id) / "spectrogram.npy")
 
-    return spectrogram_id2spec
+    return _load_parallel(spectrogram_ids, load, num_workers=num_workers)
@@ -1,9 +1,11 @@
+from typing import NamedTuple
+
 import numpy as np
 import polars as pl
 import torch
 from torch.utils.data import DataLoader, Dataset
 
-from src.array_util import pad_multiple_of
+from src.array_util import find_nearest_multiple, pad_multiple_of
 from src.constant import LABELS
 from src.transform import BaseTransform
 
@@ -15,6 +17,13 @@ def row_to_dict(row: dict, exclude_keys: list[str]):
 def pad_eeg(
     eeg: np.ndarray, cqf: np.ndarray, duration: int, padding_type: str
 ) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pad eeg (reflect) and cqf (zeros) to a multiple of `duration`.
+    Inputs that are already a multiple are returned as-is (no copy).
+    """
+    if eeg.shape[0] % duration == 0:
+        return eeg, cqf
+
     eeg = pad_multiple_of(
         eeg,
         duration,
@@ -33,48 +42,62 @@ def pad_eeg(
     return eeg, cqf
 
 
-def sample_eeg(
+def crop_and_pad_eeg(
     eeg: np.ndarray,
-    mask: np.ndarray,
+    cqf: np.ndarray,
+    start_frame: int,
+    end_frame: int,
     duration: int,
     padding_type: str,
-    num_samples: int,
-    generator: torch.Generator | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
     """
-    eeg: (num_frames, num_channels)
-    mask: (num_frames, num_channels)
-
-    return
-    ------
-    eeg: (num_samples, duration, num_channels)
-    mask: (num_samples, duration, num_channels)
+    Equivalent to `pad_eeg(eeg[start_frame:end_frame], cqf[start_frame:end_frame])`,
+    but writes the crop and the right padding (reflect for eeg, zeros for cqf)
+    directly into one preallocated float32 buffer per array instead of going
+    through `np.pad`. Other padding types fall back to `pad_eeg`.
     """
-    eeg_org, mask_org = eeg, mask
+    eeg = eeg[start_frame:end_frame]
+    cqf = cqf[start_frame:end_frame]
     num_frames = eeg.shape[0]
+    pad_size = find_nearest_multiple(num_frames, duration) - num_frames
+
+    if padding_type != "right" or pad_size >= num_frames:
+        return pad_eeg(
+            eeg.astype(np.float32, copy=False),
+            cqf.astype(np.float32, copy=False),
+            duration,
+            padding_type,
+        )
+
+    eeg_out = np.empty((num_frames + pad_size, *eeg.shape[1:]), dtype=np.float32)
+    eeg_out[:num_frames] = eeg
+    eeg_out[num_frames:] = eeg[num_frames - 1 - pad_size : num_frames - 1][::-1]
 
-    eegs = []
-    cqfs = []
-    for _ in range(num_samples):
-        if num_frames < duration:
-            eeg, cqf = pad_eeg(eeg_org, mask_org, duration, padding_type)
-        else:
-            start_frame = torch.randint(
-                num_frames - duration + 1, (1,), generator=generator
-            ).item()
-            eeg = eeg_org[start_frame : start_frame + duration]
-            cqf = mask_org[start_frame : start_frame + duration]
+    cqf_out = np.empty((num_frames + pad_size, *cqf.shape[1:]), dtype=np.float32)
+    cqf_out[:num_frames] = cqf
+    cqf_out[num_frames:] = 0
 
-        eegs.append(eeg.copy())
-        cqfs.append(cqf.copy())
+    return eeg_out, cqf_out
 
-    eeg = np.stack(eegs, axis=0)  # S, T, C
-    mask = np.stack(cqfs, axis=0)  # S, T, C
 
-    return eeg, mask
+class EegMetadata(NamedTuple):
+    """
+    Per-EEG label rows stored column-wise (SoA).
+
+    label: k p c (p: number of label postfixes)
+    weight: k w (w: number of weight keys)
+    """
+
+    start_frame: np.ndarray
+    spectrogram_id: np.ndarray
+    spec_start_frame: np.ndarray
+    label: np.ndarray
+    weight: np.ndarray
 
 
 class HmsBaseDataset(Dataset):
+    rand_pool_size = 8192
+
     def __init__(
         self,
         metadata: pl.DataFrame,
@@ -136,8 +159,24 @@ class HmsBaseDataset(Dataset):
 
     def reset(self):
         self._generator.manual_seed(self.seed)
+        self._rand_pool = np.empty(0)
+        self._rand_idx = 0
         print(f"[INFO] {self.__class__.__name__}: seed is reset to {self.seed}")
 
+    def randint(self, high: int) -> int:
+        """
+        Draw an integer in [0, high). Uniforms are drawn from `generator` in
+        batches of `rand_pool_size` instead of one `torch.randint` call per item.
+        """
+        if self._rand_idx >= len(self._rand_pool):
+            self._rand_pool = torch.rand(
+                self.rand_pool_size, generator=self._generator, dtype=torch.float64
+            ).numpy()
+            self._rand_idx = 0
+        u = self._rand_pool[self._rand_idx]
+        self._rand_idx += 1
+        return min(int(u * high), high - 1)
+
     def apply_transform(self, eeg, cqf) -> tuple[np.ndarray, np.ndarray]:
         if self._transform_enabled and self._transform is not None:
             return self._transform(eeg, cqf)
@@ -198,17 +237,70 @@ class PerEegSubsampleDataset(HmsBaseDataset):
         self.duration_sec = duration_sec
         self.sampling_rate = sampling_rate
         self.num_samples_per_eeg = num_samples_per_eeg
-        self.eeg_ids = sorted(self.metadata["eeg_id"].unique().to_list())
 
         self.spec_id2spec = spec_id2spec
         self.spec_duration_sec = spec_duration_sec
         self.spec_sampling_rate = spec_sampling_rate
         self.spec_cropped_duration = spec_cropped_duration
+        self.chunk_len = int(duration_sec * sampling_rate)
+        self.spec_chunk_len = int(spec_duration_sec * spec_sampling_rate)
+
+        # stable sort keeps the original row order within each EEG; every
+        # per-EEG entry is a view into the same set of column arrays
+        df = self.metadata.sort("eeg_id", maintain_order=True)
+        sorted_eeg_ids = df["eeg_id"].to_numpy()
+        start_frames = (
+            df["eeg_label_offset_seconds"].to_numpy() * sampling_rate
+        ).astype(np.int32)
+        spec_start_frames = (
+            df["spectrogram_label_offset_seconds"].to_numpy() * spec_sampling_rate
+        ).astype(np.int32)
+        spectrogram_ids = df["spectrogram_id"].to_numpy()
+        labels = (
+            df.select(
+                f"{label}{postfix}"
+                for postfix in self.label_postfix
+                for label in LABELS
+            )
+            .to_numpy()
+            .astype(np.float32)
+            .reshape(len(df), len(self.label_postfix), len(LABELS))
+        )
+        weights = df.select(self.weight_key).to_numpy().astype(np.float32)
+
+        self.eeg_ids = np.unique(sorted_eeg_ids)
+        heads = np.searchsorted(sorted_eeg_ids, self.eeg_ids, side="left")
+        tails = np.searchsorted(sorted_eeg_ids, self.eeg_ids, side="right")
+        self.eeg_metadata: list[EegMetadata] = [
+            EegMetadata(
+                start_frame=start_frames[head:tail],
+                spectrogram_id=spectrogram_ids[head:tail],
+                spec_start_frame=spec_start_frames[head:tail],
+                label=labels[head:tail],
+                weight=weights[head:tail],
+            )
+            for head, tail in zip(heads, tails)
+        ]
+        self._build_signal_index()
+
+    def _build_signal_index(self):
+        """
+        Dense (position in `eeg_ids`) lists of the signals, so `__getitem__`
+        indexes a list instead of hashing `eeg_id` into `id2eeg`/`id2cqf`.
+        """
+        self.eegs = [self.id2eeg[eeg_id] for eeg_id in self.eeg_ids.tolist()]
+        self.cqfs = [self.id2cqf[eeg_id] for eeg_id in self.eeg_ids.tolist()]
 
-        self.eeg_id2metadata = dict()
-        for eeg_id, df in self.metadata.to_pandas().groupby("eeg_id"):
-            self.eeg_id2metadata[eeg_id] = df.to_numpy()
-        self.key2idx = {key: idx for idx, key in enumerate(self.metadata.columns)}
+    def __getstate__(self):
+        # the lists hold views into `id2eeg`/`id2cqf`; drop them so each signal
+        # is not pickled a second time next to the mappings, and rebuild them
+        state = self.__dict__.copy()
+        del state["eegs"], state["cqfs"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_signal_index()
 
     def __len__(self):
         return len(self.eeg_ids) * self.num_samples_per_eeg
@@ -221,27 +313,23 @@ class PerEegSubsampleDataset(HmsBaseDataset):
         #
         # sample label
         #
-        eeg_id = self.eeg_ids[idx // self.num_samples_per_eeg]
-        this_eeg = self.eeg_id2metadata[eeg_id]
-        num_samples_in_this_eeg = len(this_eeg)
-        sample_idx = torch.randint(
-            num_samples_in_this_eeg, (1,), generator=self.generator
-        ).item()
-        row = this_eeg[sample_idx]
+        eeg_idx = idx // self.num_samples_per_eeg
+        eeg_id = int(self.eeg_ids[eeg_idx])
+        this_eeg = self.eeg_metadata[eeg_idx]
+        num_samples_in_this_eeg = len(this_eeg.label)
+        sample_idx = self.randint(num_samples_in_this_eeg)
 
         #
         # eeg
         #
-        eeg_label_offset_seconds = row[self.key2idx["eeg_label_offset_seconds"]]
-        start_frame = int(eeg_label_offset_seconds * self.sampling_rate)
-        end_frame = start_frame + int(self.duration_sec * self.sampling_rate)
-
-        eeg = self.id2eeg[eeg_id][start_frame:end_frame].astype(np.float32)
-        cqf = self.id2cqf[eeg_id][start_frame:end_frame].astype(np.float32)
-
-        eeg, cqf = pad_eeg(
-            eeg,
-            cqf,
+        start_frame = this_eeg.start_frame[sample_idx]
+        end_frame = start_frame + self.chunk_len
+
+        eeg, cqf = crop_and_pad_eeg(
+            self.eegs[eeg_idx],
+            self.cqfs[eeg_idx],
+            start_frame,
+            end_frame,
             self.duration,
             self.padding_type,
         )
@@ -252,19 +340,12 @@ class PerEegSubsampleDataset(HmsBaseDataset):
         # spectrogram
         #
         if self.spec_id2spec is not None:
-            spectrogram_id = row[self.key2idx["spectrogram_id"]]
-            spectrogram_label_offset_seconds = row[
-                self.key2idx["spectrogram_label_offset_seconds"]
-            ]
-            spec_start_frame = int(
-                spectrogram_label_offset_seconds * self.spec_sampling_rate
-            )
-            spec_end_frame = spec_start_frame + int(
-                self.spec_duration_sec * self.spec_sampling_rate
-            )
+            spectrogram_id = this_eeg.spectrogram_id[sample_idx]
+            spec_start_frame = this_eeg.spec_start_frame[sample_idx]
+            spec_end_frame = spec_start_frame + self.spec_chunk_len
             bg_spec = self.spec_id2spec[spectrogram_id][
                 :, spec_start_frame:spec_end_frame, :
-            ].astype(np.float32)
+            ].astype(np.float32, copy=False)
             crop_frames = spec_end_frame - spec_start_frame - self.spec_cropped_duration
 
             if crop_frames > 0:
@@ -281,18 +362,9 @@ class PerEegSubsampleDataset(HmsBaseDataset):
         # label & weight
         #
         if self.with_label:
-            label = np.array(
-                [
-                    [row[self.key2idx[f"{label}{postfix}"]] for label in LABELS]
-                    for postfix in self.label_postfix
-                ],
-                dtype=np.float32,
-            )
-            weight = np.array(
-                [row[self.key2idx[key]] for key in self.weight_key],
-                dtype=np.float32,
+            data |= dict(
+                label=this_eeg.label[sample_idx], weight=this_eeg.weight[sample_idx]
             )
-            data |= dict(label=label, weight=weight)
 
         return data
 
@@ -303,8 +375,13 @@ def get_train_loader(
     num_workers: int,
     pin_memory: bool = True,
     shuffle: bool = True,
+    persistent_workers: bool = True,
     **kwargs,
 ):
+    """
+    persistent_workers: keep workers (and their copy of the dataset) alive across
+        epochs instead of re-spawning them every epoch.
+    """
     return DataLoader(
         dataset,
         batch_size=batch_size,
@@ -312,6 +389,7 @@ def get_train_loader(
         num_workers=num_workers,
         pin_memory=pin_memory,
         drop_last=True,
+        persistent_workers=persistent_workers and num_workers > 0,
         **kwargs,
     )
 
@@ -323,6 +401,10 @@ def get_valid_loader(
     pin_memory: bool = True,
     **kwargs,
 ):
+    """
+    Workers are not persistent by default: `HmsBaseDataset.reset()` is called in
+    the main process before each evaluation and must reach the workers.
+    """
     return DataLoader(
         dataset,
         batch_size=batch_size,
@@ -50,7 +50,7 @@ class Evaluator:
     def _move_device(self, x: dict[str, torch.Tensor]):
         for k, v in x.items():
             if k in self.input_keys + [self.target_key, self.weight_key]:
-                x[k] = v.to(self.device)
+                x[k] = v.to(self.device, non_blocking=True)
 
     @torch.no_grad()
     def evaluate(
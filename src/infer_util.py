@@ -2,7 +2,6 @@ from pathlib import Path
 
 import numpy as np
 import polars as pl
-from scipy.special import softmax
 
 from src.constant import LABELS
 from src.preprocess import process_label, select_develop_samples
@@ -33,11 +32,16 @@ def load_metadata(
             metadata = metadata.filter(pl.col("weight").ge(min_weight))
 
             if group_by_eeg:
-                metadata = metadata.group_by("eeg_id", maintain_order=True).agg(
-                    pl.col("spectrogram_id").first(),
-                    pl.col("label_id").first(),
-                    pl.col(weight_key).first().alias("weight"),
-                    *[pl.col(f"{label}_prob_per_eeg").first() for label in LABELS],
+                # `*_per_eeg` columns are constant within an EEG, so keeping the
+                # first row is enough (no multi-column aggregation needed)
+                metadata = metadata.unique(
+                    subset="eeg_id", keep="first", maintain_order=True
+                ).select(
+                    "eeg_id",
+                    "spectrogram_id",
+                    "label_id",
+                    pl.col(weight_key).alias("weight"),
+                    *[f"{label}_prob_per_eeg" for label in LABELS],
                 )
 
             return metadata
@@ -61,7 +65,11 @@ def make_submission(
     T: float = 1.0,
 ):
     if apply_softmax:
-        predictions = softmax(predictions / T, axis=1)
+        # numerically stable softmax, reusing the single buffer from the division
+        predictions = np.true_divide(predictions, T)
+        predictions -= predictions.max(axis=1, keepdims=True)
+        np.exp(predictions, out=predictions)
+        predictions /= predictions.sum(axis=1, keepdims=True)
     submission_df = pl.DataFrame(
         dict(eeg_id=eeg_ids)
         | {f"{label}_vote": predictions[:, i] for i, label in enumerate(LABELS)}
@@ -19,7 +19,7 @@ class BaseAugmentation(nn.Module):
 class Compose(BaseAugmentation):
     def __init__(self, augmentations: list[BaseAugmentation], p: float = 1.0):
         super().__init__(p=p)
-        self.augmentations = augmentations
+        self.augmentations = nn.ModuleList(augmentations)
 
     def apply(self, batch: dict[str, Tensor], output: dict[str, Tensor]) -> None:
         for augmentation in self.augmentations:
@@ -7,7 +7,8 @@ from .cosine_similarity_encoder import (
 )
 from .gem import GeMPool1d, GeMPool2d, GeMPool3d
 from .mlp import Mlp
-from .util import calc_similarity, norm_mean_std, vector_pair_mapping
+from .pair_mapping import build_vector_pair_mapping
+from .util import calc_similarity, norm_mean_std
 
 __all__ = [
     "GeMPool1d",
@@ -15,7 +16,7 @@ __all__ = [
     "GeMPool3d",
     "ConvBnPReLu2d",
     "calc_similarity",
-    "vector_pair_mapping",
+    "build_vector_pair_mapping",
     "norm_mean_std",
     "CosineSimilarityEncoder1d",
     "CosineSimilarityEncoder2d",
@@ -0,0 +1,40 @@
+import torch.nn as nn
+from torch import Tensor
+
+
+class DiffMean(nn.Module):
+    def forward(self, x: Tensor, y: Tensor) -> tuple[Tensor, Tensor]:
+        return (x - y).abs(), (x + y) * 0.5
+
+
+class ProdSum(nn.Module):
+    def forward(self, x: Tensor, y: Tensor) -> tuple[Tensor, Tensor]:
+        return x + y, x * y
+
+
+class MaxMin(nn.Module):
+    def forward(self, x: Tensor, y: Tensor) -> tuple[Tensor, Tensor]:
+        return x.min(y), x.max(y)
+
+
+class PairIdentity(nn.Module):
+    def forward(self, x: Tensor, y: Tensor) -> tuple[Tensor, Tensor]:
+        return x, y
+
+
+def build_vector_pair_mapping(base_type: str = "diff-mean") -> nn.Module:
+    """
+    Pick the (x, y) -> (u, v) mapping module once, instead of dispatching on
+    `base_type` at every call.
+    """
+    match base_type:
+        case "diff-mean":
+            return DiffMean()
+        case "prod-sum":
+            return ProdSum()
+        case "max-min":
+            return MaxMin()
+        case "identity":
+            return PairIdentity()
+        case _:
+            raise ValueError(f"Invalid base_type: {base_type}")
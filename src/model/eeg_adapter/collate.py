@@ -1,4 +1,3 @@
-import torch
 import torch.nn as nn
 from einops import rearrange
 from torch import Tensor
@@ -15,27 +14,20 @@ def dual_stack_eeg_channels(
     spec: (2, b, 10, t)
     mask: (2, b, 10, t)
     """
-    ll = x[:, 0:4]
-    lp = x[:, 4:8]
-    z = x[:, 8:10]
-    rp = x[:, 10:14]
-    rl = x[:, 14:18]
-
-    left = torch.cat([ll, lp], dim=1)
-    right = torch.cat([rl, rp], dim=1)
+    # write each block straight into the output instead of chaining cats
+    num_channels = 8 + (0 if drop_z else 2) + (1 if plus_one else 0)
+    out = x.new_empty((2, x.shape[0], num_channels, *x.shape[2:]))
+    out[0, :, 0:8] = x[:, 0:8]  # ll, lp
+    out[1, :, 0:4] = x[:, 14:18]  # rl
+    out[1, :, 4:8] = x[:, 10:14]  # rp
 
     if not drop_z:
-        left = torch.cat([left, z], dim=1)
-        right = torch.cat([right, z], dim=1)
+        out[:, :, 8:10] = x[:, 8:10]
 
     if plus_one:
-        z_comp = -(z[:, 0] + z[:, 1]).unsqueeze(1)  # Pz-Fz
-        left = torch.cat([left, z_comp], dim=1)
-        right = torch.cat([right, z_comp], dim=1)
-
-    x = torch.stack([left, right], dim=0)
+        out[:, :, -1] = -(x[:, 8] + x[:, 9])  # Pz-Fz
 
-    return x
+    return out
 
 
 class EegDualStackingCollator(nn.Module):
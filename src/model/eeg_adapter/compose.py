@@ -5,7 +5,7 @@ from torch import Tensor
 class Compose(nn.Module):
     def __init__(self, targets: list[nn.Module]):
         super().__init__()
-        self.targets = targets
+        self.targets = nn.ModuleList(targets)
 
     def __repl__(self) -> str:
         adapter_classes = [adapter.__class__.__name__ for adapter in self.targets]
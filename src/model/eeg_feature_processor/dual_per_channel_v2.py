@@ -6,7 +6,7 @@ from torch import Tensor
 from src.model.basic_block import (
     CosineSimilarityEncoder2d,
     GeMPool2d,
-    vector_pair_mapping,
+    build_vector_pair_mapping,
 )
 
 
@@ -28,6 +28,7 @@ class EegDualPerChannelFeatureProcessorV2(nn.Module):
         self.hidden_dim = hidden_dim
         self.num_eeg_channels = num_eeg_channels
         self.lr_mapping_type = lr_mapping_type
+        self.lr_mapping = build_vector_pair_mapping(lr_mapping_type)
         self.similarity_encoder = CosineSimilarityEncoder2d(
             hidden_dim=hidden_dim, activation=activation()
         )
@@ -46,7 +47,7 @@ class EegDualPerChannelFeatureProcessorV2(nn.Module):
         x = rearrange(x, "(d ch b) c t -> d b c ch t", d=2, ch=self.num_eeg_channels)
         x_left, x_right = x[0], x[1]
         feats = []
-        feats.extend(list(vector_pair_mapping(x_left, x_right, self.lr_mapping_type)))
+        feats.extend(list(self.lr_mapping(x_left, x_right)))
         sim = self.similarity_encoder(x_left, x_right)
         feats.append(sim)
         x = torch.cat(feats, dim=1)  # b c ch t
@@ -22,6 +22,19 @@ class ChannelCollator(nn.Module):
         self.probe_groups = probe_groups
         self.clip_val = clip_val
 
+        # bipolar montage as two gather indices: channel k is `probe1[k] - probe2[k]`
+        pairs = [
+            (PROBE2IDX[p1], PROBE2IDX[p2])
+            for probes in probe_groups.values()
+            for p1, p2 in zip(probes[:-1], probes[1:])
+        ]
+        self.register_buffer(
+            "probe1_idxs", torch.tensor([p1 for p1, _ in pairs]), persistent=False
+        )
+        self.register_buffer(
+            "probe2_idxs", torch.tensor([p2 for _, p2 in pairs]), persistent=False
+        )
+
     def __repr__(self):
         return f"""{self.__class__.__name__}(
             sampling_rate={self.sampling_rate},
@@ -38,22 +51,18 @@ class ChannelCollator(nn.Module):
         - eeg: (B, C, T)
         - eeg_mask: (B, C, T)
         """
-        eegs = []
-        eeg_masks = []
-
         if mask is None:
             mask = torch.ones_like(x)
 
-        for _, probes in self.probe_groups.items():
-            for p1, p2 in zip(probes[:-1], probes[1:]):
-                x_diff = x[..., PROBE2IDX[p1]] - x[..., PROBE2IDX[p2]]
-                if self.apply_mask:
-                    x_diff *= mask[..., PROBE2IDX[p1]] * mask[..., PROBE2IDX[p2]]
-                eegs.append(x_diff)
-                eeg_masks.append(mask[..., PROBE2IDX[p1]] * mask[..., PROBE2IDX[p2]])
-
-        eegs = torch.stack(eegs, dim=1)
-        eeg_masks = torch.stack(eeg_masks, dim=1)
+        # gather all pairs at once: (B, T, C) -> (B, C, T)
+        x = x.transpose(1, 2)
+        mask = mask.transpose(1, 2)
+        eegs = x.index_select(1, self.probe1_idxs) - x.index_select(1, self.probe2_idxs)
+        eeg_masks = mask.index_select(1, self.probe1_idxs) * mask.index_select(
+            1, self.probe2_idxs
+        )
+        if self.apply_mask:
+            eegs *= eeg_masks
 
         with torch.autocast(device_type="cuda", enabled=False):
             if self.cutoff_freqs[0] is not None:
@@ -40,6 +40,8 @@ class HmsModel1d(nn.Module):
         self.spec_key = spec_key
         self.label_key = label_key
         self.weight_key = weight_key
+        # plain bool: avoid an OmegaConf lookup (and a dynamo guard on it) per forward
+        self.input_mask = bool(cfg.input_mask)
 
     def preprocess(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
         eeg = batch[self.feature_key]
@@ -55,7 +57,7 @@ class HmsModel1d(nn.Module):
         eeg, eeg_mask = output["eeg"], output["eeg_mask"]
         eeg, eeg_mask = self.eeg_adapter(eeg, eeg_mask)
 
-        if self.cfg.input_mask:
+        if self.input_mask:
             output["eeg"] = torch.cat([eeg, eeg_mask], dim=1)
         else:
             output["eeg"] = eeg
@@ -123,7 +125,7 @@ def check_model(
     eeg, eeg_mask = model.eeg_adapter(eeg, eeg_mask)
     print_shapes("Eeg Adapter", model.eeg_adapter, dict(eeg=eeg, eeg_mask=eeg_mask))
 
-    if model.cfg.input_mask:
+    if model.input_mask:
         x = torch.cat([eeg, eeg_mask], dim=1)
         print_shapes("Merge Mask", None, {"x": x})
     else:
@@ -33,9 +33,13 @@ class AverageMeter(object):
 
 
 def move_device(x: dict[str, torch.Tensor], input_keys: list[str], device: str):
+    """
+    Batches come from pinned memory (`pin_memory=True` in the loaders), so the
+    host-to-device copies can be issued asynchronously.
+    """
     for k, v in x.items():
         if k in input_keys:
-            x[k] = v.to(device)
+            x[k] = v.to(device, non_blocking=True)
 
 
 def get_model(cfg: ArchitectureConfig, **kwargs) -> nn.Module:
@@ -177,7 +177,7 @@ class Trainer(BaseTrainer):
     def _move_device(self, x: dict[str, torch.Tensor]):
         for k, v in x.items():
             if k in self.input_keys + [self.target_key, self.weight_key]:
-                x[k] = v.to(self.device)
+                x[k] = v.to(self.device, non_blocking=True)
 
     def _calc_loss(
         self,
@@ -26,61 +26,64 @@ FR_CORRESPONDENCE = [
 CENTRAL_CHANNELS = ["Fz", "Cz", "Pz"]
 
 
+def _swap_permutation(correspondences: list) -> np.ndarray:
+    """
+    Compose the pairwise swaps into one channel permutation: `x[..., perm]`.
+    """
+    perm = np.arange(len(PROBE2IDX))
+    for src, dst in correspondences:
+        src_idx, dst_idx = PROBE2IDX[src], PROBE2IDX[dst]
+        perm[[src_idx, dst_idx]] = perm[[dst_idx, src_idx]]
+    return perm
+
+
+LR_PERMUTATION = _swap_permutation(LR_CORRESPONDENCE)
+FR_PERMUTATION = _swap_permutation(FR_CORRESPONDENCE)
+
+
 def _swap_channels(
     feature: np.ndarray,
     mask: np.ndarray,
-    correspondences: list,
+    perm: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
-    feature, mask = feature.copy(), mask.copy()
-    for src, dst in correspondences:
-        src_idx, dst_idx = PROBE2IDX[src], PROBE2IDX[dst]
-        feature[..., [src_idx, dst_idx]] = feature[..., [dst_idx, src_idx]].copy()
-        mask[..., [src_idx, dst_idx]] = mask[..., [dst_idx, src_idx]].copy()
-
-    return feature, mask
+    perm = perm[: feature.shape[-1]]
+    return np.take(feature, perm, axis=-1), np.take(mask, perm, axis=-1)
 
 
 def swap_lr(
     feature: np.ndarray,
     mask: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
-    return _swap_channels(feature, mask, LR_CORRESPONDENCE)
+    return _swap_channels(feature, mask, LR_PERMUTATION)
 
 
 def swap_fr(
     feature: np.ndarray,
     mask: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
-    return _swap_channels(feature, mask, FR_CORRESPONDENCE)
+    return _swap_channels(feature, mask, FR_PERMUTATION)
+
+
+LEFT_IDXS = np.array([PROBE2IDX[left] for left, _ in LR_CORRESPONDENCE])
+RIGHT_IDXS = np.array([PROBE2IDX[right] for _, right in LR_CORRESPONDENCE])
+CENTRAL_IDXS = np.array([PROBE2IDX[ch] for ch in CENTRAL_CHANNELS])
 
 
 def channel_permutation(
     feature: np.ndarray,
     mask: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
-    feature, mask = feature.copy(), mask.copy()
-    left_idxs, right_idxs = [], []
-    for left, right in LR_CORRESPONDENCE:
-        left_idx, right_idx = PROBE2IDX[left], PROBE2IDX[right]
-        left_idxs.append(left_idx)
-        right_idxs.append(right_idx)
-
-    left_idxs = np.array(left_idxs)
-    right_idxs = np.array(right_idxs)
+    # build one full-length permutation and gather once
+    full_perm = np.arange(feature.shape[-1])
 
-    perm = torch.randperm(len(left_idxs)).numpy()
+    perm = torch.randperm(len(LEFT_IDXS)).numpy()
+    full_perm[LEFT_IDXS] = LEFT_IDXS[perm]
+    full_perm[RIGHT_IDXS] = RIGHT_IDXS[perm]
 
-    feature[..., left_idxs] = feature[..., left_idxs[perm]].copy()
-    feature[..., right_idxs] = feature[..., right_idxs[perm]].copy()
-    mask[..., left_idxs] = mask[..., left_idxs[perm]].copy()
-    mask[..., right_idxs] = mask[..., right_idxs[perm]].copy()
+    perm = torch.randperm(len(CENTRAL_IDXS)).numpy()
+    full_perm[CENTRAL_IDXS] = CENTRAL_IDXS[perm]
 
-    central_idxs = np.array([PROBE2IDX[ch] for ch in CENTRAL_CHANNELS])
-    perm = torch.randperm(len(central_idxs)).numpy()
-    feature[..., central_idxs] = feature[..., central_idxs[perm]].copy()
-    mask[..., central_idxs] = mask[..., central_idxs[perm]].copy()
-
-    return feature, mask
+    return np.take(feature, full_perm, axis=-1), np.take(mask, full_perm, axis=-1)
 
 
 def channel_drop(
@@ -91,15 +94,14 @@ def channel_drop(
     """
     feature: (num_frames, num_features)
     """
-    feature, mask = feature.copy(), mask.copy()
     t, ch = feature.shape[-2:]
 
     shuffled_idxs = np.random.permutation(ch)
+    keep = np.ones(ch, dtype=bool)
+    keep[shuffled_idxs[: int(ch * drop_rate)]] = False
 
-    feature[..., shuffled_idxs[: int(ch * drop_rate)]] = 0.0
-    mask[..., shuffled_idxs[: int(ch * drop_rate)]] = 0.0
-
-    return feature, mask
+    # one pass per array into a new buffer (the input may be the preloaded array)
+    return np.where(keep, feature, 0.0), np.where(keep, mask, 0.0)
 
 
 class SwapLr(BaseTransform):